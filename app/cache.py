@@ -0,0 +1,166 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import current_app, g
+from markupsafe import Markup
+
+
+class LRUCache:
+    """Bounded in-process cache; least recently used entries are evicted."""
+
+    def __init__(self, maxsize=2048):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisBackend:
+    """Shared second tier so all workers reuse each other's fragments."""
+
+    def __init__(self, url, timeout):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError('FRAGMENT_CACHE_URL requires the "redis" package') from exc
+        self._client = redis.Redis.from_url(url)
+        self.timeout = timeout
+
+    def get(self, key):
+        try:
+            value = self._client.get(key)
+        except Exception:
+            return None
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value):
+        try:
+            self._client.set(key, value.encode('utf-8'), ex=self.timeout)
+        except Exception:
+            pass
+
+
+class FragmentCache:
+    """Caches rendered template fragments.
+
+    Used from Jinja as a call block; the body is only rendered on a miss::
+
+        {% call cache_fragment('aset-row', asset.id, asset.updated_at) %}
+            ...
+        {% endcall %}
+
+    Keys must contain everything the fragment depends on (typically an id
+    plus ``updated_at`` values), so stale entries are never read again and
+    simply age out of the LRU. Every key is also prefixed with a version,
+    ``FRAGMENT_CACHE_VERSION`` or else a checksum of all templates, so a
+    deploy that changes the markup never reads fragments from the old one.
+    """
+
+    def __init__(self, app=None):
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+        self.version = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('FRAGMENT_CACHE_SIZE', 2048)
+        app.config.setdefault('FRAGMENT_CACHE_URL', None)
+        app.config.setdefault('FRAGMENT_CACHE_TIMEOUT', 7 * 24 * 60 * 60)
+        app.config.setdefault('FRAGMENT_CACHE_VERSION', None)
+
+        self.local = LRUCache(app.config['FRAGMENT_CACHE_SIZE'])
+        self.shared = None
+        if app.config['FRAGMENT_CACHE_URL']:
+            self.shared = RedisBackend(
+                app.config['FRAGMENT_CACHE_URL'], app.config['FRAGMENT_CACHE_TIMEOUT']
+            )
+
+        app.extensions['fragment_cache'] = self
+        app.add_template_global(self.fragment, 'cache_fragment')
+
+    def _count(self, hit):
+        with self._counter_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _version(self):
+        if self.version is not None:
+            return self.version
+        version = current_app.config['FRAGMENT_CACHE_VERSION']
+        if version:
+            self.version = version
+            return version
+        env = current_app.jinja_env
+        if env.auto_reload:
+            # Templates may change under a running dev server: re-check once
+            # per request rather than once per process.
+            if 'fragment_cache_version' not in g:
+                g.fragment_cache_version = self._template_checksum(env)
+            return g.fragment_cache_version
+        self.version = self._template_checksum(env)
+        return self.version
+
+    @staticmethod
+    def _template_checksum(env):
+        digest = hashlib.blake2b(digest_size=6)
+        for name in sorted(env.list_templates()):
+            digest.update(name.encode('utf-8'))
+            digest.update(env.loader.get_source(env, name)[0].encode('utf-8'))
+        return digest.hexdigest()
+
+    def fragment(self, *key, caller):
+        cache_key = f'frag:{self._version()}:' + ':'.join(str(part) for part in key)
+
+        value = self.local.get(cache_key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(cache_key)
+            if value is not None:
+                self.local.set(cache_key, value)
+
+        if value is not None:
+            self._count(True)
+            return Markup(value)
+
+        self._count(False)
+        value = str(caller())
+        self.local.set(cache_key, value)
+        if self.shared is not None:
+            self.shared.set(cache_key, value)
+        return Markup(value)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else None,
+            'size': len(self.local),
+            'maxsize': self.local.maxsize,
+            'shared': self.shared is not None,
+            'version': self.version,
+        }
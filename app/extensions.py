@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 
+from app.replica import RoutingSession
+
 # Single shared SQLAlchemy instance
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
@@ -0,0 +1,123 @@
+from datetime import datetime
+from functools import lru_cache, wraps
+import hashlib
+import os
+import uuid
+
+from flask import current_app, url_for, session, redirect, flash
+
+from app.extensions import db
+from app.models import Asset, Category, Location
+
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def upload_path(file_path):
+    """Absolute filesystem path for a stored ``uploads/...`` file_path."""
+    base = os.path.dirname(os.path.abspath(current_app.config['UPLOAD_FOLDER']))
+    return os.path.join(base, file_path)
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(path, mtime_ns, size):
+    h = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_fingerprint(file_path):
+    try:
+        st = os.stat(upload_path(file_path))
+    except OSError:
+        return None
+    return _file_digest(upload_path(file_path), st.st_mtime_ns, st.st_size)
+
+
+def media_url(file_path):
+    """Content-fingerprinted URL for an uploaded photo or QR code.
+
+    The fingerprint changes whenever the file does, so responses can be
+    cached by browsers forever. With ``MEDIA_PUBLIC_URL`` set, URLs point
+    straight at the front-end server and never reach Python.
+    """
+    fingerprint = file_fingerprint(file_path) or '0'
+    public_url = current_app.config.get('MEDIA_PUBLIC_URL')
+    if public_url:
+        relative = file_path.split('/', 1)[1] if file_path.startswith('uploads/') else file_path
+        return f"{public_url.rstrip('/')}/{relative}?v={fingerprint}"
+    return url_for('media.media_file', fingerprint=fingerprint, file_path=file_path)
+
+
+def reference_version():
+    """Changes whenever any category or location is renamed.
+
+    Part of the asset-row fragment cache key, since rows show those names.
+    """
+    row = db.session.execute(
+        db.select(
+            db.select(db.func.max(Category.updated_at)).scalar_subquery(),
+            db.select(db.func.max(Location.updated_at)).scalar_subquery(),
+        )
+    ).one()
+    return '|'.join(str(value) for value in row)
+
+
+def generate_asset_code():
+    today = datetime.utcnow().strftime('%Y%m%d')
+
+    # Soft-deleted assets still hold their (unique) codes.
+    assets = Asset.query.execution_options(include_deleted=True)
+
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    count = assets.filter(Asset.created_at >= today_start).count()
+
+    code = f"AST-{today}-{count + 1:04d}"
+
+    while assets.filter_by(asset_code=code).first():
+        count += 1
+        code = f"AST-{today}-{count + 1:04d}"
+
+    return code
+
+
+def generate_qr_code(asset):
+    # qrcode pulls in Pillow; import on first use so app startup stays cheap.
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+
+    asset_url = url_for('public.public_aset_detail', id=asset.id, _external=True)
+
+    qr.add_data(asset_url)
+    qr.make(fit=True)
+
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    filename = f"QR_{asset.asset_code}_{uuid.uuid4().hex[:8]}.png"
+    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], 'qrcodes', filename)
+
+    img.save(filepath)
+
+    return f"uploads/qrcodes/{filename}", asset_url
+
+
+def login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            flash('Silakan login terlebih dahulu', 'warning')
+            return redirect(url_for('main.login'))
+        return f(*args, **kwargs)
+
+    return decorated_function
@@ -1,9 +1,107 @@
 from datetime import datetime
 
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, with_loader_criteria
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from app.extensions import db
 
+# MySQL's DATETIME defaults to whole seconds; change-tracking timestamps
+# (fragment cache keys, sync cursors) need to tell apart edits made within
+# the same second.
+PreciseDateTime = db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql', 'mariadb')
+
+
+class SoftDeleteMixin:
+    """Rows with ``deleted_at`` set are hidden from every ORM query.
+
+    Pass ``execution_options(include_deleted=True)`` to see them (trash
+    views, restore, purge).
+    """
+
+    deleted_at = db.Column(db.DateTime, index=True)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _hide_soft_deleted(execute_state):
+    if execute_state.is_column_load or execute_state.execution_options.get('include_deleted'):
+        return
+    if execute_state.is_select or execute_state.is_update or execute_state.is_delete:
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True,
+            )
+        )
+
+
+class ChangeTrackedMixin:
+    """Rows stamped with ``change_seq`` on every insert and update.
+
+    The value comes from :func:`next_change_seq`, so it follows commit
+    order; ``/sync/changes`` pages by it. Bulk UPDATEs bypass the flush and
+    must set ``change_seq=next_change_seq(db.session)`` themselves.
+    """
+
+    change_seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0', index=True)
+
+
+class ChangeSequence(db.Model):
+    """Single-row counter behind :func:`next_change_seq`."""
+
+    __tablename__ = 'change_seq'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    value = db.Column(db.BigInteger, nullable=False)
+
+
+def next_change_seq(session):
+    """The change sequence number for the session's current transaction.
+
+    The first call in a transaction increments the counter row, which keeps
+    it locked until commit. Other writers wait for that lock, so numbers
+    become visible strictly in the order they were handed out: a reader
+    that has seen ``n`` will never later find a commit with a number below
+    ``n``, however long a transaction runs.
+    """
+    seq = session.info.get('change_seq')
+    if seq is None:
+        conn = session.connection()
+        table = ChangeSequence.__table__
+        bump = table.update().where(table.c.id == 1).values(value=table.c.value + 1)
+        if not conn.execute(bump).rowcount:
+            try:
+                with conn.begin_nested():
+                    conn.execute(table.insert().values(id=1, value=1))
+            except IntegrityError:
+                conn.execute(bump)
+        seq = conn.execute(db.select(table.c.value).where(table.c.id == 1)).scalar_one()
+        session.info['change_seq'] = seq
+    return seq
+
+
+@event.listens_for(Session, 'before_flush')
+def _stamp_change_seq(session, flush_context, instances):
+    changed = [obj for obj in session.new if isinstance(obj, ChangeTrackedMixin)]
+    changed += [
+        obj
+        for obj in session.dirty
+        if isinstance(obj, ChangeTrackedMixin)
+        and session.is_modified(obj, include_collections=False)
+    ]
+    if changed:
+        seq = next_change_seq(session)
+        for obj in changed:
+            obj.change_seq = seq
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _forget_change_seq(session, transaction):
+    session.info.pop('change_seq', None)
+
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -15,29 +113,44 @@ class User(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        method = current_app.config.get('PASSWORD_HASH_METHOD')
+        if method:
+            self.password_hash = generate_password_hash(password, method=method)
+        else:
+            self.password_hash = generate_password_hash(password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
 
-class Location(db.Model):
+class LoginBucket(db.Model):
+    __tablename__ = 'login_buckets'
+    key = db.Column(db.String(255), primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)
+
+
+class Location(SoftDeleteMixin, ChangeTrackedMixin, db.Model):
     __tablename__ = 'locations'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(
+        PreciseDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
+    )
 
 
-class Category(db.Model):
+class Category(SoftDeleteMixin, ChangeTrackedMixin, db.Model):
     __tablename__ = 'categories'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(
+        PreciseDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
+    )
 
 
-class Asset(db.Model):
+class Asset(SoftDeleteMixin, ChangeTrackedMixin, db.Model):
     __tablename__ = 'assets'
     id = db.Column(db.Integer, primary_key=True)
     asset_code = db.Column(db.String(50), unique=True, nullable=False)
@@ -47,7 +160,9 @@ class Asset(db.Model):
     condition = db.Column(db.String(50))
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(
+        PreciseDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
+    )
 
     category = db.relationship('Category', backref='assets')
     location = db.relationship('Location', backref='assets')
@@ -85,3 +200,27 @@ class AssetHistory(db.Model):
 
     asset = db.relationship('Asset', backref='history')
     user = db.relationship('User', backref='activities')
+
+
+class SyncTombstone(ChangeTrackedMixin, db.Model):
+    """Records deletions so offline clients can drop their local copies."""
+
+    __tablename__ = 'sync_tombstones'
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(PreciseDateTime, default=datetime.utcnow, index=True)
+
+
+class AssetRollup(db.Model):
+    """Live asset counts per (category, location, condition).
+
+    Maintained in the same transaction as every asset insert/edit/delete;
+    see app/rollup.py.
+    """
+
+    __tablename__ = 'asset_rollup'
+    category_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    location_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    condition = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
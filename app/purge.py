@@ -0,0 +1,114 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.extensions import db
+from app.helpers import upload_path
+from app.models import Asset, AssetHistory, AssetPhoto, Category, Location, QRCode
+
+logger = logging.getLogger(__name__)
+
+
+def _remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning('Could not remove %s', path, exc_info=True)
+
+
+def _expired_ids(model, cutoff, batch_size, *criteria):
+    return db.session.execute(
+        db.select(model.id)
+        .where(model.deleted_at < cutoff, *criteria)
+        .order_by(model.id)
+        .limit(batch_size)
+        .execution_options(include_deleted=True)
+    ).scalars().all()
+
+
+def _delete_where(model, *criteria):
+    db.session.execute(
+        db.delete(model)
+        .where(*criteria)
+        .execution_options(include_deleted=True, synchronize_session=False)
+    )
+
+
+def purge_deleted(retention_days, batch_size=200, pause=0.1):
+    """Hard-delete rows soft-deleted more than ``retention_days`` ago.
+
+    Works in batches of ``batch_size`` rows, each in its own short
+    transaction, so locks on the hot tables are only held briefly. Photo
+    and QR files are unlinked on a background thread after each commit.
+    Categories and locations are only removed once no asset (deleted or
+    not) refers to them any more.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    counts = {'assets': 0, 'categories': 0, 'locations': 0, 'files': 0}
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='purge-files') as files:
+        while True:
+            ids = _expired_ids(Asset, cutoff, batch_size)
+            if not ids:
+                break
+
+            paths = db.session.execute(
+                db.union_all(
+                    db.select(AssetPhoto.file_path).where(AssetPhoto.asset_id.in_(ids)),
+                    db.select(QRCode.file_path).where(QRCode.asset_id.in_(ids)),
+                )
+            ).scalars().all()
+            paths = [upload_path(path) for path in paths if path]
+
+            _delete_where(AssetPhoto, AssetPhoto.asset_id.in_(ids))
+            _delete_where(QRCode, QRCode.asset_id.in_(ids))
+            _delete_where(AssetHistory, AssetHistory.asset_id.in_(ids))
+            _delete_where(Asset, Asset.id.in_(ids))
+            db.session.commit()
+
+            files.submit(_remove_files, paths)
+            counts['assets'] += len(ids)
+            counts['files'] += len(paths)
+            time.sleep(pause)
+
+        for name, model, fk in (
+            ('categories', Category, Asset.category_id),
+            ('locations', Location, Asset.location_id),
+        ):
+            unused = ~db.exists().where(fk == model.id)
+            while True:
+                ids = _expired_ids(model, cutoff, batch_size, unused)
+                if not ids:
+                    break
+                _delete_where(model, model.id.in_(ids))
+                db.session.commit()
+                counts[name] += len(ids)
+                time.sleep(pause)
+
+    return counts
+
+
+@click.command('purge-deleted')
+@click.option('--days', type=int, default=None, help='Retention in days (default: PURGE_RETENTION_DAYS).')
+@click.option('--batch-size', type=int, default=None, help='Rows per transaction (default: PURGE_BATCH_SIZE).')
+@with_appcontext
+def purge_deleted_command(days, batch_size):
+    """Permanently remove soft-deleted assets, categories and locations."""
+    counts = purge_deleted(
+        current_app.config['PURGE_RETENTION_DAYS'] if days is None else days,
+        batch_size or current_app.config['PURGE_BATCH_SIZE'],
+        current_app.config['PURGE_BATCH_PAUSE'],
+    )
+    click.echo(
+        'Purged {assets} assets ({files} files), {categories} categories, '
+        '{locations} locations'.format(**counts)
+    )
@@ -0,0 +1,176 @@
+import random
+import threading
+import time
+
+import sqlalchemy as sa
+from flask import request, session as http_session
+from flask_sqlalchemy.session import Session
+
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+# GET endpoints that must read from the primary. /sync/changes relies on
+# change_seq becoming visible in commit order; a replica that applies
+# transactions in parallel could expose a higher number first and the
+# scanner's cursor would move past a row that hasn't been replicated yet.
+PRIMARY_ENDPOINTS = (
+    'static',
+    'media.media_file',
+    'main.healthz',
+    'main.readyz',
+    'scan.sync_changes',
+)
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to ``info['read_bind']`` when one is set.
+
+    Everything else (flushes, INSERT/UPDATE/DELETE, raw SQL) and any read
+    made after the session has pending changes goes to the primary. A read
+    that fails because the replica went away is retried once on the primary.
+    """
+
+    def _read(self, method, statement, *args, **kwargs):
+        replica = self.info.get('read_bind')
+        try:
+            return method(statement, *args, **kwargs)
+        except sa.exc.DBAPIError as exc:
+            if (
+                replica is None
+                or not (exc.connection_invalidated or isinstance(exc, sa.exc.OperationalError))
+                or self.get_bind(clause=statement) is not replica
+            ):
+                raise
+            # The replica died under this request (the engine's handle_error
+            # listener has already marked it unhealthy): finish on the primary.
+            self.info.pop('read_bind', None)
+            return method(statement, *args, **kwargs)
+
+    def execute(self, statement, *args, **kwargs):
+        return self._read(super().execute, statement, *args, **kwargs)
+
+    def scalar(self, statement, *args, **kwargs):
+        return self._read(super().scalar, statement, *args, **kwargs)
+
+    def scalars(self, statement, *args, **kwargs):
+        return self._read(super().scalars, statement, *args, **kwargs)
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get('read_bind')
+        if (
+            replica is not None
+            and bind is None
+            and not self._flushing
+            and isinstance(clause, sa.sql.Select)
+            and not (self.new or self.dirty or self.deleted)
+        ):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaRouter:
+    """Routes read-only requests to healthy read replicas.
+
+    Replicas are ordinary ``SQLALCHEMY_BINDS`` entries listed in
+    ``SQLALCHEMY_REPLICA_BINDS``. GET/HEAD requests read from a random
+    healthy replica; other methods, and every request from the same
+    browser within ``REPLICA_STICKY_SECONDS`` after one of them, use the
+    primary so users always see their own writes.
+    """
+
+    def __init__(self, db, app=None):
+        self.db = db
+        self._health = {}
+        self._probes = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SQLALCHEMY_REPLICA_BINDS', [])
+        app.config.setdefault('REPLICA_STICKY_SECONDS', 10)
+        app.config.setdefault('REPLICA_HEALTH_INTERVAL', 10)
+        app.config.setdefault('REPLICA_PROBE_TIMEOUT', 0.5)
+
+        self.config = app.config
+        app.extensions['replica_router'] = self
+        if not app.config['SQLALCHEMY_REPLICA_BINDS']:
+            return
+
+        with app.app_context():
+            for key in app.config['SQLALCHEMY_REPLICA_BINDS']:
+                sa.event.listen(self.db.engines[key], 'handle_error', self._on_error(key))
+
+        app.before_request(self._choose_bind)
+        app.after_request(self._mark_write)
+
+    def _on_error(self, key):
+        def handle_error(context):
+            if context.is_disconnect or isinstance(
+                context.sqlalchemy_exception, sa.exc.OperationalError
+            ):
+                self._set_health(key, False)
+
+        return handle_error
+
+    def _set_health(self, key, healthy):
+        with self._lock:
+            self._health[key] = (healthy, time.monotonic())
+
+    def is_healthy(self, key):
+        healthy, checked = self._health.get(key, (None, 0.0))
+        if healthy is not None and time.monotonic() - checked < self.config['REPLICA_HEALTH_INTERVAL']:
+            return healthy
+
+        with self._lock:
+            probe = self._probes.get(key)
+            if probe is None:
+                probe = threading.Thread(
+                    target=self._probe, args=(key, self.db.engines[key]), daemon=True
+                )
+                self._probes[key] = probe
+                probe.start()
+        probe.join(self.config['REPLICA_PROBE_TIMEOUT'])
+        if probe.is_alive():
+            # Too slow to serve from; skip it until the probe finishes or the
+            # health interval passes, instead of stalling every request.
+            self._set_health(key, False)
+            return False
+        return self._health[key][0]
+
+    def _probe(self, key, engine):
+        try:
+            with engine.connect() as conn:
+                conn.execute(sa.text('SELECT 1'))
+            healthy = True
+        except sa.exc.SQLAlchemyError:
+            healthy = False
+        self._set_health(key, healthy)
+        with self._lock:
+            self._probes.pop(key, None)
+
+    def pick(self):
+        keys = list(self.config['SQLALCHEMY_REPLICA_BINDS'])
+        random.shuffle(keys)
+        for key in keys:
+            if self.is_healthy(key):
+                return self.db.engines[key]
+        return None
+
+    def status(self):
+        return {key: self.is_healthy(key) for key in self.config['SQLALCHEMY_REPLICA_BINDS']}
+
+    def _choose_bind(self):
+        if request.method not in SAFE_METHODS:
+            return
+        if http_session.get('db_primary_until', 0) > time.time():
+            return
+        if request.endpoint in PRIMARY_ENDPOINTS:
+            return
+        replica = self.pick()
+        if replica is not None:
+            self.db.session.info['read_bind'] = replica
+
+    def _mark_write(self, response):
+        if request.method not in SAFE_METHODS:
+            http_session['db_primary_until'] = time.time() + self.config['REPLICA_STICKY_SECONDS']
+        return response
@@ -0,0 +1,82 @@
+import click
+from flask.cli import with_appcontext
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import Asset, AssetRollup
+
+
+def rollup_key(category_id, location_id, condition):
+    return (int(category_id or 0), int(location_id or 0), condition or '')
+
+
+def asset_key(asset):
+    return rollup_key(asset.category_id, asset.location_id, asset.condition)
+
+
+def adjust(key, delta):
+    """Add ``delta`` to the counter for ``key`` in the current transaction."""
+    category_id, location_id, condition = key
+    match = (
+        (AssetRollup.category_id == category_id)
+        & (AssetRollup.location_id == location_id)
+        & (AssetRollup.condition == condition)
+    )
+    update = (
+        db.update(AssetRollup)
+        .where(match)
+        .values(count=AssetRollup.count + delta)
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.execute(update).rowcount:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(
+                db.insert(AssetRollup).values(
+                    category_id=category_id,
+                    location_id=location_id,
+                    condition=condition,
+                    count=delta,
+                )
+            )
+    except IntegrityError:
+        # Another transaction created the row first.
+        db.session.execute(update)
+
+
+def move(old_key, new_key, count=1):
+    if old_key != new_key:
+        adjust(old_key, -count)
+        adjust(new_key, count)
+
+
+def rebuild():
+    """Recompute the whole rollup from ``assets`` in one set-based pass."""
+    db.session.execute(db.delete(AssetRollup))
+    db.session.execute(
+        db.insert(AssetRollup).from_select(
+            ['category_id', 'location_id', 'condition', 'count'],
+            db.select(
+                db.func.coalesce(Asset.category_id, 0),
+                db.func.coalesce(Asset.location_id, 0),
+                db.func.coalesce(Asset.condition, ''),
+                db.func.count(),
+            )
+            .where(Asset.deleted_at.is_(None))
+            .group_by(
+                db.func.coalesce(Asset.category_id, 0),
+                db.func.coalesce(Asset.location_id, 0),
+                db.func.coalesce(Asset.condition, ''),
+            ),
+        )
+    )
+
+
+@click.command('rollup-rebuild')
+@with_appcontext
+def rollup_rebuild_command():
+    """Rebuild the category x location x condition asset counts."""
+    rebuild()
+    db.session.commit()
+    click.echo('Asset rollup rebuilt')
@@ -0,0 +1,566 @@
+from datetime import datetime
+
+from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
+
+from app import rollup
+from app.extensions import db
+from app.helpers import (
+    allowed_file,
+    generate_asset_code,
+    generate_qr_code,
+    login_required,
+    reference_version,
+)
+from app.models import Location, Category, Asset, QRCode, AssetPhoto, AssetHistory, next_change_seq
+from app.sync import clear_deletion, record_deletion
+
+bp = Blueprint('aset', __name__)
+
+
+def asset_filters(category_filter, location_filter, condition_filter, search_query):
+    criteria = []
+
+    if category_filter:
+        criteria.append(Asset.category_id == category_filter)
+
+    if location_filter:
+        criteria.append(Asset.location_id == location_filter)
+
+    if condition_filter:
+        criteria.append(Asset.condition == condition_filter)
+
+    if search_query:
+        search_pattern = f"%{search_query}%"
+        criteria.append(
+            db.or_(
+                Asset.name.like(search_pattern),
+                Asset.asset_code.like(search_pattern),
+            )
+        )
+
+    return criteria
+
+
+@bp.route('/aset')
+@login_required
+def aset_list():
+    category_filter = request.args.get('category', '')
+    location_filter = request.args.get('location', '')
+    condition_filter = request.args.get('condition', '')
+    search_query = request.args.get('search', '')
+
+    query = Asset.query.filter(
+        *asset_filters(category_filter, location_filter, condition_filter, search_query)
+    )
+
+    pagination = query.order_by(Asset.created_at.desc(), Asset.id.desc()).paginate(
+        page=request.args.get('page', 1, type=int),
+        per_page=current_app.config['ASET_PER_PAGE'],
+        error_out=False,
+    )
+
+    categories = Category.query.order_by(Category.name).all()
+    locations = Location.query.order_by(Location.name).all()
+
+    return render_template(
+        'aset/list.html',
+        assets=pagination.items,
+        pagination=pagination,
+        filter_args={
+            key: value
+            for key, value in (
+                ('search', search_query),
+                ('category', category_filter),
+                ('location', location_filter),
+                ('condition', condition_filter),
+            )
+            if value
+        },
+        categories=categories,
+        locations=locations,
+        ref_version=reference_version(),
+        category_filter=category_filter,
+        location_filter=location_filter,
+        condition_filter=condition_filter,
+        search_query=search_query,
+    )
+
+
+@bp.route('/aset/bulk', methods=['POST'])
+@login_required
+def aset_bulk_edit():
+    filters = {
+        'category': request.form.get('category', ''),
+        'location': request.form.get('location', ''),
+        'condition': request.form.get('condition', ''),
+        'search': request.form.get('search', ''),
+    }
+    back = redirect(url_for('aset.aset_list', **{k: v for k, v in filters.items() if v}))
+
+    new_category_id = request.form.get('new_category_id', type=int)
+    new_location_id = request.form.get('new_location_id', type=int)
+    new_condition = request.form.get('new_condition', '').strip()
+
+    values = {}
+    changes = []
+    if new_category_id:
+        category = Category.query.get(new_category_id)
+        if not category:
+            flash('Kategori tidak ditemukan', 'danger')
+            return back
+        values['category_id'] = new_category_id
+        changes.append(f"kategori → '{category.name}'")
+    if new_location_id:
+        location = Location.query.get(new_location_id)
+        if not location:
+            flash('Lokasi tidak ditemukan', 'danger')
+            return back
+        values['location_id'] = new_location_id
+        changes.append(f"lokasi → '{location.name}'")
+    if new_condition:
+        values['condition'] = new_condition
+        changes.append(f"kondisi → '{new_condition}'")
+
+    if not values:
+        flash('Pilih minimal satu perubahan (kategori, lokasi, atau kondisi)', 'warning')
+        return back
+
+    if request.form.get('scope') == 'filter':
+        criteria = asset_filters(
+            filters['category'], filters['location'], filters['condition'], filters['search']
+        )
+    else:
+        ids = [int(i) for i in request.form.getlist('ids') if i.isdigit()]
+        if not ids:
+            flash('Tidak ada aset yang dipilih', 'warning')
+            return back
+        criteria = [Asset.id.in_(ids)]
+
+    # Only rows that actually change; everything below is set-based, so the
+    # number of affected assets never determines memory use.
+    criteria.append(Asset.deleted_at.is_(None))
+    criteria.append(
+        db.or_(*[getattr(Asset, column).is_distinct_from(value) for column, value in values.items()])
+    )
+
+    # Lock the change sequence first and then the matching rows (the order
+    # aset_edit uses too), so no edit can commit between the counts below
+    # and the UPDATE and leave the rollup off.
+    change_seq = next_change_seq(db.session)
+    groups = db.session.execute(
+        db.select(Asset.category_id, Asset.location_id, Asset.condition, db.func.count())
+        .where(*criteria)
+        .group_by(Asset.category_id, Asset.location_id, Asset.condition)
+        .with_for_update()
+    ).all()
+    if not groups:
+        flash('Tidak ada aset yang perlu diubah', 'info')
+        return back
+
+    for category_id, location_id, condition, count in groups:
+        old_key = rollup.rollup_key(category_id, location_id, condition)
+        new_key = rollup.rollup_key(
+            values.get('category_id', category_id),
+            values.get('location_id', location_id),
+            values.get('condition', condition),
+        )
+        rollup.move(old_key, new_key, count)
+
+    now = datetime.utcnow()
+    change_desc = ', '.join(changes)
+    db.session.execute(
+        db.insert(AssetHistory).from_select(
+            ['asset_id', 'user_id', 'action', 'description', 'timestamp'],
+            db.select(
+                Asset.id,
+                db.literal(session['user_id']),
+                db.literal('BULK_EDIT'),
+                db.literal('Mengubah aset ') + Asset.asset_code + db.literal(f' (massal): {change_desc}'),
+                db.literal(now),
+            ).where(*criteria),
+        )
+    )
+
+    updated = db.session.execute(
+        db.update(Asset)
+        .where(*criteria)
+        .values(updated_at=now, change_seq=change_seq, **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    db.session.commit()
+
+    flash(f'{updated} aset berhasil diperbarui: {change_desc}', 'success')
+    return back
+
+
+@bp.route('/aset/detail/<int:id>')
+@login_required
+def aset_detail(id):
+    asset = Asset.query.get_or_404(id)
+
+    history = AssetHistory.query.filter_by(asset_id=id).order_by(
+        AssetHistory.timestamp.desc()
+    ).all()
+
+    return render_template('aset/detail.html', asset=asset, history=history)
+
+
+@bp.route('/aset/edit/<int:id>', methods=['GET', 'POST'])
+@login_required
+def aset_edit(id):
+    asset = Asset.query.get_or_404(id)
+
+    if request.method == 'POST':
+        # Same lock order as aset_bulk_edit; re-reading under the row lock
+        # keeps old_key (and so the rollup) from going stale.
+        next_change_seq(db.session)
+        db.session.refresh(asset, with_for_update=True)
+
+        name = request.form.get('name', '').strip()
+        category_id = request.form.get('category_id')
+        location_id = request.form.get('location_id')
+        condition = request.form.get('condition', '').strip()
+        description = request.form.get('description', '').strip()
+
+        if not name:
+            flash('Nama aset tidak boleh kosong', 'danger')
+            return redirect(url_for('aset.aset_edit', id=id))
+
+        if not category_id:
+            flash('Kategori harus dipilih', 'danger')
+            return redirect(url_for('aset.aset_edit', id=id))
+
+        if not location_id:
+            flash('Lokasi harus dipilih', 'danger')
+            return redirect(url_for('aset.aset_edit', id=id))
+
+        old_key = rollup.asset_key(asset)
+
+        changes = []
+        if asset.name != name:
+            changes.append(f"nama: '{asset.name}' → '{name}'")
+            asset.name = name
+
+        if str(asset.category_id) != category_id:
+            old_cat = asset.category.name
+            new_cat = Category.query.get(category_id).name
+            changes.append(f"kategori: '{old_cat}' → '{new_cat}'")
+            asset.category_id = category_id
+
+        if str(asset.location_id) != location_id:
+            old_loc = asset.location.name
+            new_loc = Location.query.get(location_id).name
+            changes.append(f"lokasi: '{old_loc}' → '{new_loc}'")
+            asset.location_id = location_id
+
+        if asset.condition != condition:
+            changes.append(f"kondisi: '{asset.condition}' → '{condition}'")
+            asset.condition = condition
+
+        if asset.description != description:
+            changes.append('deskripsi diperbarui')
+            asset.description = description
+
+        asset.updated_at = datetime.utcnow()
+        rollup.move(old_key, rollup.asset_key(asset))
+
+        if 'photo' in request.files:
+            photo = request.files['photo']
+            if photo and photo.filename and allowed_file(photo.filename):
+                import uuid
+
+                ext = photo.filename.rsplit('.', 1)[1].lower()
+                filename = f"{asset.asset_code}_{uuid.uuid4().hex[:8]}.{ext}"
+                filepath = current_app.config['UPLOAD_FOLDER'] + '/photos/' + filename
+
+                from os import path
+
+                photo.save(filepath)
+
+                asset_photo = AssetPhoto(
+                    asset_id=asset.id,
+                    file_path=f"uploads/photos/{filename}",
+                )
+                db.session.add(asset_photo)
+                changes.append('foto baru ditambahkan')
+
+        if changes:
+            change_desc = ', '.join(changes)
+            history = AssetHistory(
+                asset_id=asset.id,
+                user_id=session['user_id'],
+                action='EDIT',
+                description=f'Mengubah aset {asset.asset_code}: {change_desc}',
+            )
+            db.session.add(history)
+
+        db.session.commit()
+
+        flash(f'Aset "{name}" berhasil diperbarui', 'success')
+        return redirect(url_for('aset.aset_detail', id=id))
+
+    categories = Category.query.order_by(Category.name).all()
+    locations = Location.query.order_by(Location.name).all()
+
+    return render_template(
+        'aset/edit.html', asset=asset, categories=categories, locations=locations
+    )
+
+
+@bp.route('/aset/hapus/<int:id>', methods=['POST'])
+@login_required
+def aset_hapus(id):
+    asset = Asset.query.get_or_404(id)
+    asset_name = asset.name
+    asset_code = asset.asset_code
+
+    # Soft delete only: photos, QR codes and history stay until the purge
+    # job (flask purge-deleted) removes assets deleted long enough ago.
+    asset.deleted_at = datetime.utcnow()
+    rollup.adjust(rollup.asset_key(asset), -1)
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='DELETE',
+        description=f'Menghapus aset: {asset_name} ({asset_code})',
+    )
+    db.session.add(history)
+
+    record_deletion('assets', id)
+    db.session.commit()
+
+    flash(f'Aset "{asset_name}" ({asset_code}) berhasil dihapus', 'success')
+    return redirect(url_for('aset.aset_list'))
+
+
+@bp.route('/aset/terhapus')
+@login_required
+def aset_terhapus():
+    assets = (
+        Asset.query.execution_options(include_deleted=True)
+        .filter(Asset.deleted_at.isnot(None))
+        .order_by(Asset.deleted_at.desc())
+        .all()
+    )
+    return render_template(
+        'aset/terhapus.html',
+        assets=assets,
+        retention_days=current_app.config['PURGE_RETENTION_DAYS'],
+    )
+
+
+@bp.route('/aset/pulihkan/<int:id>', methods=['POST'])
+@login_required
+def aset_pulihkan(id):
+    asset = (
+        Asset.query.execution_options(include_deleted=True)
+        .filter(Asset.id == id, Asset.deleted_at.isnot(None))
+        .first_or_404()
+    )
+
+    if not Category.query.get(asset.category_id) or not Location.query.get(asset.location_id):
+        flash(
+            f'Aset "{asset.name}" tidak dapat dipulihkan karena kategori atau lokasinya sudah dihapus',
+            'danger',
+        )
+        return redirect(url_for('aset.aset_terhapus'))
+
+    asset.deleted_at = None
+    rollup.adjust(rollup.asset_key(asset), 1)
+    clear_deletion('assets', id)
+
+    history = AssetHistory(
+        asset_id=asset.id,
+        user_id=session['user_id'],
+        action='RESTORE',
+        description=f'Memulihkan aset: {asset.name} ({asset.asset_code})',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+
+    flash(f'Aset "{asset.name}" ({asset.asset_code}) berhasil dipulihkan', 'success')
+    return redirect(url_for('aset.aset_detail', id=id))
+
+
+@bp.route('/aset/foto/hapus/<int:id>', methods=['POST'])
+@login_required
+def aset_foto_hapus(id):
+    import os
+
+    # Joining the asset applies the soft-delete filter, so photos of a
+    # deleted asset 404 instead of failing halfway through.
+    photo = (
+        AssetPhoto.query.join(AssetPhoto.asset)
+        .filter(AssetPhoto.id == id)
+        .first_or_404()
+    )
+    asset_id = photo.asset_id
+    asset = photo.asset
+    photo_path = os.path.join('app/static', photo.file_path)
+
+    db.session.delete(photo)
+    asset.updated_at = datetime.utcnow()
+
+    history = AssetHistory(
+        asset_id=asset_id,
+        user_id=session['user_id'],
+        action='DELETE_PHOTO',
+        description=f'Menghapus foto dari aset {asset.asset_code}',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+
+    if os.path.exists(photo_path):
+        os.remove(photo_path)
+
+    flash('Foto berhasil dihapus', 'success')
+    return redirect(url_for('aset.aset_detail', id=asset_id))
+
+
+@bp.route('/aset/qr/generate/<int:id>', methods=['POST'])
+@login_required
+def qr_generate(id):
+    asset = Asset.query.get_or_404(id)
+
+    existing_qr = QRCode.query.filter_by(asset_id=id).first()
+    if existing_qr:
+        flash('QR Code sudah ada. Gunakan "Regenerate" untuk membuat ulang.', 'warning')
+        return redirect(url_for('aset.aset_detail', id=id))
+
+    qr_path, qr_value = generate_qr_code(asset)
+
+    qr_code = QRCode(asset_id=asset.id, file_path=qr_path, qr_value=qr_value)
+    db.session.add(qr_code)
+
+    history = AssetHistory(
+        asset_id=asset.id,
+        user_id=session['user_id'],
+        action='GENERATE_QR',
+        description=f'Generate QR Code untuk aset {asset.asset_code}',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+
+    flash('QR Code berhasil di-generate', 'success')
+    return redirect(url_for('aset.aset_detail', id=id))
+
+
+@bp.route('/aset/qr/regenerate/<int:id>', methods=['POST'])
+@login_required
+def qr_regenerate(id):
+    import os
+
+    asset = Asset.query.get_or_404(id)
+
+    old_qrs = QRCode.query.filter_by(asset_id=id).all()
+    for old_qr in old_qrs:
+        qr_path = os.path.join('app/static', old_qr.file_path)
+        if os.path.exists(qr_path):
+            os.remove(qr_path)
+        db.session.delete(old_qr)
+
+    qr_path, qr_value = generate_qr_code(asset)
+
+    qr_code = QRCode(asset_id=asset.id, file_path=qr_path, qr_value=qr_value)
+    db.session.add(qr_code)
+
+    history = AssetHistory(
+        asset_id=asset.id,
+        user_id=session['user_id'],
+        action='REGENERATE_QR',
+        description=f'Regenerate QR Code untuk aset {asset.asset_code}',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+
+    flash('QR Code berhasil di-regenerate', 'success')
+    return redirect(url_for('aset.aset_detail', id=id))
+
+
+@bp.route('/aset/tambah', methods=['GET', 'POST'])
+@login_required
+def aset_tambah():
+    if request.method == 'POST':
+        name = request.form.get('name', '').strip()
+        category_id = request.form.get('category_id')
+        location_id = request.form.get('location_id')
+        condition = request.form.get('condition', '').strip()
+        description = request.form.get('description', '').strip()
+
+        if not name:
+            flash('Nama aset tidak boleh kosong', 'danger')
+            return redirect(url_for('aset.aset_tambah'))
+
+        if not category_id:
+            flash('Kategori harus dipilih', 'danger')
+            return redirect(url_for('aset.aset_tambah'))
+
+        if not location_id:
+            flash('Lokasi harus dipilih', 'danger')
+            return redirect(url_for('aset.aset_tambah'))
+
+        asset_code = generate_asset_code()
+
+        asset = Asset(
+            asset_code=asset_code,
+            name=name,
+            category_id=category_id,
+            location_id=location_id,
+            condition=condition,
+            description=description,
+        )
+
+        db.session.add(asset)
+        db.session.flush()
+        rollup.adjust(rollup.asset_key(asset), 1)
+
+        if 'photo' in request.files:
+            photo = request.files['photo']
+            if photo and photo.filename and allowed_file(photo.filename):
+                import uuid
+
+                ext = photo.filename.rsplit('.', 1)[1].lower()
+                filename = f"{asset.asset_code}_{uuid.uuid4().hex[:8]}.{ext}"
+                filepath = current_app.config['UPLOAD_FOLDER'] + '/photos/' + filename
+
+                from os import path
+
+                photo.save(filepath)
+
+                asset_photo = AssetPhoto(
+                    asset_id=asset.id,
+                    file_path=f"uploads/photos/{filename}",
+                )
+                db.session.add(asset_photo)
+
+        qr_path, qr_value = generate_qr_code(asset)
+        qr_code = QRCode(asset_id=asset.id, file_path=qr_path, qr_value=qr_value)
+        db.session.add(qr_code)
+
+        history = AssetHistory(
+            asset_id=asset.id,
+            user_id=session['user_id'],
+            action='ADD',
+            description=f'Menambahkan aset: {name} ({asset_code})',
+        )
+        db.session.add(history)
+
+        db.session.commit()
+
+        flash(
+            f'Aset "{name}" berhasil ditambahkan dengan kode {asset_code}',
+            'success',
+        )
+        return redirect(url_for('aset.aset_list'))
+
+    categories = Category.query.order_by(Category.name).all()
+    locations = Location.query.order_by(Location.name).all()
+
+    return render_template(
+        'aset/tambah.html', categories=categories, locations=locations
+    )
@@ -0,0 +1,150 @@
+from datetime import datetime
+
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+
+from app.extensions import db
+from app.helpers import login_required
+from app.models import Category, Asset, AssetHistory
+from app.sync import clear_deletion, record_deletion
+
+bp = Blueprint('kategori', __name__)
+
+
+@bp.route('/kategori')
+@login_required
+def kategori_list():
+    categories = Category.query.order_by(Category.created_at.desc()).all()
+    deleted_categories = (
+        Category.query.execution_options(include_deleted=True)
+        .filter(Category.deleted_at.isnot(None))
+        .order_by(Category.deleted_at.desc())
+        .all()
+    )
+    return render_template(
+        'kategori/list.html', categories=categories, deleted_categories=deleted_categories
+    )
+
+
+@bp.route('/kategori/tambah', methods=['POST'])
+@login_required
+def kategori_tambah():
+    name = request.form.get('name', '').strip()
+
+    if not name:
+        flash('Nama kategori tidak boleh kosong', 'danger')
+        return redirect(url_for('kategori.kategori_list'))
+
+    # Names are unique in the table, including soft-deleted categories.
+    existing = (
+        Category.query.execution_options(include_deleted=True).filter_by(name=name).first()
+    )
+    if existing:
+        if existing.deleted_at:
+            flash('Nama kategori sudah digunakan oleh kategori yang terhapus, pulihkan kategori tersebut', 'danger')
+        else:
+            flash('Nama kategori sudah digunakan', 'danger')
+        return redirect(url_for('kategori.kategori_list'))
+
+    category = Category(name=name)
+    db.session.add(category)
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='ADD_CATEGORY',
+        description=f'Menambahkan kategori: {name}',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+    flash(f'Kategori "{name}" berhasil ditambahkan', 'success')
+    return redirect(url_for('kategori.kategori_list'))
+
+
+@bp.route('/kategori/edit/<int:id>', methods=['POST'])
+@login_required
+def kategori_edit(id):
+    category = Category.query.get_or_404(id)
+    name = request.form.get('name', '').strip()
+
+    if not name:
+        flash('Nama kategori tidak boleh kosong', 'danger')
+        return redirect(url_for('kategori.kategori_list'))
+
+    existing = Category.query.execution_options(include_deleted=True).filter(
+        Category.name == name, Category.id != id
+    ).first()
+    if existing:
+        if existing.deleted_at:
+            flash('Nama kategori sudah digunakan oleh kategori yang terhapus, pulihkan kategori tersebut', 'danger')
+        else:
+            flash('Nama kategori sudah digunakan', 'danger')
+        return redirect(url_for('kategori.kategori_list'))
+
+    old_name = category.name
+    category.name = name
+    category.updated_at = datetime.utcnow()
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='EDIT_CATEGORY',
+        description=f'Mengubah kategori dari "{old_name}" menjadi "{name}"',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+    flash(f'Kategori berhasil diubah menjadi "{name}"', 'success')
+    return redirect(url_for('kategori.kategori_list'))
+
+
+@bp.route('/kategori/hapus/<int:id>', methods=['POST'])
+@login_required
+def kategori_hapus(id):
+    category = Category.query.get_or_404(id)
+
+    asset_count = Asset.query.filter_by(category_id=id).count()
+    if asset_count > 0:
+        flash(
+            f'Kategori "{category.name}" tidak dapat dihapus karena masih digunakan oleh {asset_count} aset',
+            'danger',
+        )
+        return redirect(url_for('kategori.kategori_list'))
+
+    name = category.name
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='DELETE_CATEGORY',
+        description=f'Menghapus kategori: {name}',
+    )
+    db.session.add(history)
+
+    category.deleted_at = datetime.utcnow()
+    record_deletion('categories', id)
+    db.session.commit()
+
+    flash(f'Kategori "{name}" berhasil dihapus', 'success')
+    return redirect(url_for('kategori.kategori_list'))
+
+
+@bp.route('/kategori/pulihkan/<int:id>', methods=['POST'])
+@login_required
+def kategori_pulihkan(id):
+    category = (
+        Category.query.execution_options(include_deleted=True)
+        .filter(Category.id == id, Category.deleted_at.isnot(None))
+        .first_or_404()
+    )
+
+    category.deleted_at = None
+    clear_deletion('categories', id)
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='RESTORE_CATEGORY',
+        description=f'Memulihkan kategori: {category.name}',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+    flash(f'Kategori "{category.name}" berhasil dipulihkan', 'success')
+    return redirect(url_for('kategori.kategori_list'))
@@ -0,0 +1,92 @@
+import csv
+import io
+
+from flask import Blueprint, render_template, request
+
+from app.extensions import db
+from app.helpers import login_required
+from app.models import Location, Category, AssetRollup
+
+bp = Blueprint('laporan', __name__)
+
+CONDITIONS = ['Baik', 'Rusak Ringan', 'Rusak Berat']
+
+
+def build_pivot(condition_filter):
+    """Category x location counts read from the rollup table only."""
+    query = db.select(
+        AssetRollup.category_id,
+        AssetRollup.location_id,
+        db.func.sum(AssetRollup.count),
+    ).group_by(AssetRollup.category_id, AssetRollup.location_id)
+    if condition_filter:
+        query = query.where(AssetRollup.condition == condition_filter)
+
+    cells = {
+        (category_id, location_id): int(total)
+        for category_id, location_id, total in db.session.execute(query)
+        if total
+    }
+
+    categories = Category.query.order_by(Category.name).all()
+    locations = Location.query.order_by(Location.name).all()
+
+    rows = []
+    for category in categories:
+        counts = [cells.get((category.id, location.id), 0) for location in locations]
+        rows.append((category, counts, sum(counts)))
+
+    column_totals = [
+        sum(cells.get((category.id, location.id), 0) for category in categories)
+        for location in locations
+    ]
+    return locations, rows, column_totals, sum(column_totals)
+
+
+@bp.route('/laporan')
+@login_required
+def laporan_index():
+    condition_filter = request.args.get('condition', '')
+    locations, rows, column_totals, grand_total = build_pivot(condition_filter)
+
+    condition_totals = dict(
+        db.session.execute(
+            db.select(AssetRollup.condition, db.func.sum(AssetRollup.count))
+            .group_by(AssetRollup.condition)
+        ).all()
+    )
+
+    return render_template(
+        'laporan/index.html',
+        locations=locations,
+        rows=rows,
+        column_totals=column_totals,
+        grand_total=grand_total,
+        conditions=CONDITIONS,
+        condition_totals=condition_totals,
+        condition_filter=condition_filter,
+    )
+
+
+@bp.route('/laporan/csv')
+@login_required
+def laporan_csv():
+    condition_filter = request.args.get('condition', '')
+    locations, rows, column_totals, grand_total = build_pivot(condition_filter)
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['Kategori'] + [location.name for location in locations] + ['Total'])
+    for category, counts, total in rows:
+        writer.writerow([category.name] + counts + [total])
+    writer.writerow(['Total'] + column_totals + [grand_total])
+
+    suffix = condition_filter.lower().replace(' ', '_') if condition_filter else 'semua'
+    return (
+        out.getvalue(),
+        200,
+        {
+            'Content-Type': 'text/csv; charset=utf-8',
+            'Content-Disposition': f'attachment; filename=laporan_aset_{suffix}.csv',
+        },
+    )
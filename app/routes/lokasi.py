@@ -0,0 +1,139 @@
+from datetime import datetime
+
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+
+from app.extensions import db
+from app.helpers import login_required
+from app.models import Location, Asset, AssetHistory
+from app.sync import clear_deletion, record_deletion
+
+bp = Blueprint('lokasi', __name__)
+
+
+@bp.route('/lokasi')
+@login_required
+def lokasi_list():
+    locations = Location.query.order_by(Location.created_at.desc()).all()
+    deleted_locations = (
+        Location.query.execution_options(include_deleted=True)
+        .filter(Location.deleted_at.isnot(None))
+        .order_by(Location.deleted_at.desc())
+        .all()
+    )
+    return render_template(
+        'lokasi/list.html', locations=locations, deleted_locations=deleted_locations
+    )
+
+
+@bp.route('/lokasi/tambah', methods=['POST'])
+@login_required
+def lokasi_tambah():
+    name = request.form.get('name', '').strip()
+
+    if not name:
+        flash('Nama lokasi tidak boleh kosong', 'danger')
+        return redirect(url_for('lokasi.lokasi_list'))
+
+    existing = Location.query.filter_by(name=name).first()
+    if existing:
+        flash('Nama lokasi sudah digunakan', 'danger')
+        return redirect(url_for('lokasi.lokasi_list'))
+
+    location = Location(name=name)
+    db.session.add(location)
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='ADD_LOCATION',
+        description=f'Menambahkan lokasi: {name}',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+    flash(f'Lokasi "{name}" berhasil ditambahkan', 'success')
+    return redirect(url_for('lokasi.lokasi_list'))
+
+
+@bp.route('/lokasi/edit/<int:id>', methods=['POST'])
+@login_required
+def lokasi_edit(id):
+    location = Location.query.get_or_404(id)
+    name = request.form.get('name', '').strip()
+
+    if not name:
+        flash('Nama lokasi tidak boleh kosong', 'danger')
+        return redirect(url_for('lokasi.lokasi_list'))
+
+    existing = Location.query.filter(Location.name == name, Location.id != id).first()
+    if existing:
+        flash('Nama lokasi sudah digunakan', 'danger')
+        return redirect(url_for('lokasi.lokasi_list'))
+
+    old_name = location.name
+    location.name = name
+    location.updated_at = datetime.utcnow()
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='EDIT_LOCATION',
+        description=f'Mengubah lokasi dari "{old_name}" menjadi "{name}"',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+    flash(f'Lokasi berhasil diubah menjadi "{name}"', 'success')
+    return redirect(url_for('lokasi.lokasi_list'))
+
+
+@bp.route('/lokasi/hapus/<int:id>', methods=['POST'])
+@login_required
+def lokasi_hapus(id):
+    location = Location.query.get_or_404(id)
+
+    asset_count = Asset.query.filter_by(location_id=id).count()
+    if asset_count > 0:
+        flash(
+            f'Lokasi "{location.name}" tidak dapat dihapus karena masih digunakan oleh {asset_count} aset',
+            'danger',
+        )
+        return redirect(url_for('lokasi.lokasi_list'))
+
+    name = location.name
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='DELETE_LOCATION',
+        description=f'Menghapus lokasi: {name}',
+    )
+    db.session.add(history)
+
+    location.deleted_at = datetime.utcnow()
+    record_deletion('locations', id)
+    db.session.commit()
+
+    flash(f'Lokasi "{name}" berhasil dihapus', 'success')
+    return redirect(url_for('lokasi.lokasi_list'))
+
+
+@bp.route('/lokasi/pulihkan/<int:id>', methods=['POST'])
+@login_required
+def lokasi_pulihkan(id):
+    location = (
+        Location.query.execution_options(include_deleted=True)
+        .filter(Location.id == id, Location.deleted_at.isnot(None))
+        .first_or_404()
+    )
+
+    location.deleted_at = None
+    clear_deletion('locations', id)
+
+    history = AssetHistory(
+        user_id=session['user_id'],
+        action='RESTORE_LOCATION',
+        description=f'Memulihkan lokasi: {location.name}',
+    )
+    db.session.add(history)
+
+    db.session.commit()
+    flash(f'Lokasi "{location.name}" berhasil dipulihkan', 'success')
+    return redirect(url_for('lokasi.lokasi_list'))
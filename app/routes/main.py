@@ -0,0 +1,114 @@
+from datetime import datetime
+
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, session, url_for
+
+from app.extensions import db
+from app.helpers import login_required
+from app.models import User, Category, Asset, QRCode, AssetHistory
+from app.security import LoginBusy
+
+bp = Blueprint('main', __name__)
+
+
+@bp.route('/')
+def index():
+    if 'user_id' in session:
+        return redirect(url_for('main.dashboard'))
+    return redirect(url_for('main.login'))
+
+
+@bp.route('/healthz')
+def healthz():
+    return jsonify(status='ok')
+
+
+@bp.route('/readyz')
+def readyz():
+    try:
+        db.session.execute(db.text('SELECT 1'))
+    except Exception as exc:
+        db.session.rollback()
+        return jsonify(status='unavailable', database=str(exc.__class__.__name__)), 503
+    replicas = current_app.extensions['replica_router'].status()
+    return jsonify(status='ok', database='ok', replicas=replicas)
+
+
+@bp.route('/metrics/cache')
+@login_required
+def cache_metrics():
+    return jsonify(fragment_cache=current_app.extensions['fragment_cache'].stats())
+
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if 'user_id' in session:
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        username = request.form.get('username', '').strip()
+        password = request.form.get('password', '')
+
+        if not username or not password:
+            flash('Username dan password tidak boleh kosong', 'danger')
+            return render_template('login.html')
+
+        guard = current_app.extensions['login_guard']
+        if not guard.allow(username, request.remote_addr):
+            flash('Terlalu banyak percobaan login, silakan coba lagi nanti', 'danger')
+            return render_template('login.html'), 429
+
+        user = User.query.filter_by(username=username).first()
+
+        try:
+            valid = guard.verify(user.password_hash if user else None, password)
+            if valid and guard.needs_rehash(user.password_hash):
+                user.password_hash = guard.hash_password(password)
+                db.session.commit()
+        except LoginBusy:
+            flash('Server sedang sibuk, silakan coba lagi', 'warning')
+            return render_template('login.html'), 503
+
+        if user and valid:
+            session['user_id'] = user.id
+            session['username'] = user.username
+            session['role'] = user.role
+            flash(f'Selamat datang, {user.username}!', 'success')
+            return redirect(url_for('main.dashboard'))
+        else:
+            flash('Username atau password salah', 'danger')
+            return render_template('login.html')
+
+    return render_template('login.html')
+
+
+@bp.route('/logout')
+def logout():
+    session.clear()
+    flash('Anda telah logout', 'info')
+    return redirect(url_for('main.login'))
+
+
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    total_assets = Asset.query.count()
+    total_categories = Category.query.count()
+    total_qr_generated = QRCode.query.join(QRCode.asset).count()
+
+    today = datetime.utcnow().date()
+    today_activities = AssetHistory.query.filter(
+        db.func.date(AssetHistory.timestamp) == today
+    ).count()
+
+    recent_activities = AssetHistory.query.order_by(
+        AssetHistory.timestamp.desc()
+    ).limit(10).all()
+
+    return render_template(
+        'dashboard.html',
+        total_assets=total_assets,
+        total_categories=total_categories,
+        total_qr_generated=total_qr_generated,
+        today_activities=today_activities,
+        recent_activities=recent_activities,
+    )
@@ -0,0 +1,48 @@
+import mimetypes
+import os
+
+from flask import Blueprint, abort, current_app, make_response, redirect, send_file
+from werkzeug.utils import safe_join
+
+from app.helpers import file_fingerprint, media_url, upload_path
+
+bp = Blueprint('media', __name__)
+
+ONE_YEAR = 365 * 24 * 60 * 60
+
+
+@bp.route('/media/<fingerprint>/<path:file_path>')
+def media_file(fingerprint, file_path):
+    """Serve an uploaded photo/QR code with immutable caching.
+
+    Delivery, in order of preference:
+
+    * ``MEDIA_X_ACCEL_PREFIX`` set: nginx ``X-Accel-Redirect`` to an
+      ``internal`` location aliased to the uploads folder.
+    * ``USE_X_SENDFILE`` set: Apache/lighttpd ``X-Sendfile``.
+    * otherwise the file is streamed by the WSGI server; gunicorn uses
+      ``os.sendfile`` for it, and Range/If-None-Match are honoured.
+    """
+    if not file_path.startswith('uploads/') or safe_join('', file_path) is None:
+        abort(404)
+
+    path = upload_path(file_path)
+    if not os.path.isfile(path):
+        abort(404)
+
+    current = file_fingerprint(file_path)
+    if current != fingerprint:
+        return redirect(media_url(file_path))
+
+    accel_prefix = current_app.config.get('MEDIA_X_ACCEL_PREFIX')
+    if accel_prefix:
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = (
+            accel_prefix.rstrip('/') + '/' + file_path.split('/', 1)[1]
+        )
+        response.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    else:
+        response = send_file(path, conditional=True, etag=fingerprint)
+
+    response.headers['Cache-Control'] = f'public, max-age={ONE_YEAR}, immutable'
+    return response
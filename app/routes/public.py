@@ -0,0 +1,11 @@
+from flask import Blueprint, render_template
+
+from app.models import Asset
+
+bp = Blueprint('public', __name__)
+
+
+@bp.route('/public/aset/<int:id>')
+def public_aset_detail(id):
+    asset = Asset.query.get_or_404(id)
+    return render_template('public/aset_detail.html', asset=asset)
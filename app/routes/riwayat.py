@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from flask import Blueprint, render_template, request
+
+from app.extensions import db
+from app.helpers import login_required
+from app.models import User, AssetHistory
+
+bp = Blueprint('riwayat', __name__)
+
+
+@bp.route('/riwayat')
+@login_required
+def riwayat_list():
+    user_filter = request.args.get('user', '')
+    action_filter = request.args.get('action', '')
+    date_filter = request.args.get('date', '')
+
+    query = AssetHistory.query
+
+    if user_filter:
+        query = query.filter_by(user_id=user_filter)
+
+    if action_filter:
+        query = query.filter_by(action=action_filter)
+
+    if date_filter:
+        try:
+            filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
+            query = query.filter(db.func.date(AssetHistory.timestamp) == filter_date)
+        except ValueError:
+            pass
+
+    activities = query.order_by(AssetHistory.timestamp.desc()).all()
+
+    users = User.query.order_by(User.username).all()
+
+    actions = (
+        db.session.query(AssetHistory.action)
+        .distinct()
+        .order_by(AssetHistory.action)
+        .all()
+    )
+    actions = [a[0] for a in actions if a[0]]
+
+    return render_template(
+        'riwayat/list.html',
+        activities=activities,
+        users=users,
+        actions=actions,
+        user_filter=user_filter,
+        action_filter=action_filter,
+        date_filter=date_filter,
+    )
@@ -0,0 +1,34 @@
+import gzip
+import json
+
+from flask import Blueprint, abort, current_app, render_template, request
+
+from app.helpers import login_required
+from app.sync import InvalidCursor, changes_since
+
+bp = Blueprint('scan', __name__)
+
+
+@bp.route('/scan')
+@login_required
+def scan_qr():
+    return render_template('scan/qr_scanner.html')
+
+
+@bp.route('/sync/changes')
+@login_required
+def sync_changes():
+    limit = max(1, min(request.args.get('limit', 500, type=int), 2000))
+    try:
+        payload = changes_since(request.args.get('cursor', ''), limit)
+    except InvalidCursor:
+        abort(400)
+
+    body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    response = current_app.response_class(body, mimetype='application/json')
+    response.headers['Cache-Control'] = 'no-store'
+    response.vary.add('Accept-Encoding')
+    if len(body) > 1024 and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
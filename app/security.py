@@ -0,0 +1,244 @@
+import hashlib
+import os
+import random
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from app.extensions import db
+
+try:
+    import fcntl
+except ImportError:  # Windows: waitress runs a single process anyway.
+    fcntl = None
+
+
+class LoginBusy(Exception):
+    """Raised when every hash worker is busy and the wait queue is full."""
+
+
+class MemoryTokenBucket:
+    """Per-process token buckets, bounded to ``max_keys`` entries (LRU)."""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_per_sec):
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * refill_per_sec)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed
+
+
+class DatabaseTokenBucket:
+    """Token buckets stored in ``login_buckets`` so all workers share them."""
+
+    def consume(self, key, capacity, refill_per_sec):
+        from app.models import LoginBucket
+
+        table = LoginBucket.__table__
+        now = time.time()
+        with db.engine.begin() as conn:
+            row = self._locked_row(conn, table, key)
+            if row is None:
+                # Nothing to lock yet: create a full bucket, and if another
+                # worker won that race, lock the row it just inserted.
+                try:
+                    with conn.begin_nested():
+                        conn.execute(table.insert().values(key=key, tokens=capacity, updated_at=now))
+                except IntegrityError:
+                    pass
+                row = self._locked_row(conn, table, key)
+
+            tokens = min(capacity, row.tokens + max(0.0, now - row.updated_at) * refill_per_sec)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                table.update()
+                .where(table.c.key == key)
+                .values(tokens=tokens, updated_at=now)
+            )
+        return allowed
+
+    @staticmethod
+    def _locked_row(conn, table, key):
+        return conn.execute(
+            db.select(table.c.tokens, table.c.updated_at)
+            .where(table.c.key == key)
+            .with_for_update()
+        ).first()
+
+
+class HostSlots:
+    """Counting semaphore shared by every process on this host.
+
+    Each slot is a lock file held with ``flock``; the kernel releases it
+    when the descriptor is closed, including when a worker is killed.
+    Without ``fcntl`` the slots are only shared between threads.
+    """
+
+    def __init__(self, directory, size):
+        self.paths = [os.path.join(directory, f'slot{i}.lock') for i in range(size)]
+        self.directory = directory
+        self._local = threading.BoundedSemaphore(size) if fcntl is None else None
+
+    def acquire(self, timeout):
+        if self._local is not None:
+            return self._local if self._local.acquire(timeout=timeout) else None
+
+        os.makedirs(self.directory, exist_ok=True)
+        deadline = time.monotonic() + timeout
+        while True:
+            for path in random.sample(self.paths, len(self.paths)):
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except BlockingIOError:
+                    os.close(fd)
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.01)
+
+    def release(self, token):
+        if self._local is not None:
+            self._local.release()
+        else:
+            os.close(token)
+
+
+class LoginGuard:
+    """Keeps login attempts from monopolising CPU.
+
+    Attempts are rate limited per (username, client IP) and per client IP
+    before any password hash is computed. Hashing runs on a small pool per
+    process, and every hash first takes one of ``LOGIN_HASH_WORKERS`` host-wide
+    slots, so across all gunicorn workers at most that many cores are ever
+    spent on password hashing.
+    """
+
+    def __init__(self, app=None):
+        self._executor = None
+        self._slots = None
+        self._host_slots = None
+        self._dummy_hash = None
+        self._dummy_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('LOGIN_RATE_LIMIT_BACKEND', 'memory')
+        app.config.setdefault('LOGIN_USER_BURST', 5)
+        app.config.setdefault('LOGIN_USER_PER_MINUTE', 5)
+        app.config.setdefault('LOGIN_IP_BURST', 20)
+        app.config.setdefault('LOGIN_IP_PER_MINUTE', 20)
+        app.config.setdefault('LOGIN_HASH_WORKERS', 2)
+        app.config.setdefault('LOGIN_HASH_QUEUE', 8)
+        app.config.setdefault('LOGIN_HASH_TIMEOUT', 10)
+        app.config.setdefault('LOGIN_HASH_LOCK_DIR', None)
+        app.config.setdefault('PASSWORD_HASH_METHOD', None)
+
+        if app.config['LOGIN_RATE_LIMIT_BACKEND'] == 'db':
+            self.buckets = DatabaseTokenBucket()
+        else:
+            self.buckets = MemoryTokenBucket()
+
+        workers = app.config['LOGIN_HASH_WORKERS']
+        self.config = app.config
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='login-hash')
+        self._slots = threading.BoundedSemaphore(workers + app.config['LOGIN_HASH_QUEUE'])
+        lock_dir = app.config['LOGIN_HASH_LOCK_DIR'] or os.path.join(
+            tempfile.gettempdir(),
+            'login-hash-' + hashlib.sha1(app.root_path.encode('utf-8')).hexdigest()[:12],
+        )
+        self._host_slots = HostSlots(lock_dir, workers)
+        app.extensions['login_guard'] = self
+
+    def allow(self, username, remote_addr):
+        cfg = self.config
+        # Keyed on the client too, so nobody can lock an account out by
+        # failing logins for it from elsewhere; the per-IP bucket still caps
+        # how many usernames one client can try.
+        user_ok = self.buckets.consume(
+            f'user:{username.lower()[:100]}|{remote_addr or "-"}',
+            cfg['LOGIN_USER_BURST'],
+            cfg['LOGIN_USER_PER_MINUTE'] / 60.0,
+        )
+        ip_ok = self.buckets.consume(
+            f'ip:{remote_addr or "-"}',
+            cfg['LOGIN_IP_BURST'],
+            cfg['LOGIN_IP_PER_MINUTE'] / 60.0,
+        )
+        return user_ok and ip_ok
+
+    def _run(self, fn, *args):
+        token = self._host_slots.acquire(self.config['LOGIN_HASH_TIMEOUT'])
+        if token is None:
+            raise LoginBusy()
+        try:
+            return fn(*args)
+        finally:
+            self._host_slots.release(token)
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise LoginBusy()
+        try:
+            future = self._executor.submit(self._run, fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.config['LOGIN_HASH_TIMEOUT'])
+        except FutureTimeoutError:
+            raise LoginBusy()
+
+    def _hash_kwargs(self):
+        method = self.config['PASSWORD_HASH_METHOD']
+        return {'method': method} if method else {}
+
+    def hash_password(self, password):
+        return self._submit(self._generate, password)
+
+    def _generate(self, password):
+        return generate_password_hash(password, **self._hash_kwargs())
+
+    def dummy_hash(self):
+        # Verifying against this when the username does not exist costs the
+        # same as a real check, so response time does not reveal valid users.
+        if self._dummy_hash is None:
+            with self._dummy_lock:
+                if self._dummy_hash is None:
+                    self._dummy_hash = self._generate(secrets.token_hex(16))
+        return self._dummy_hash
+
+    def verify(self, password_hash, password):
+        if password_hash is None:
+            self._submit(check_password_hash, self.dummy_hash(), password)
+            return False
+        return self._submit(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        current = self.dummy_hash().split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != current
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
@@ -0,0 +1,30 @@
+function setupBulkEdit() {
+    const selectAll = document.getElementById('bulkSelectAll');
+    const selectedBtn = document.getElementById('bulkSelectedBtn');
+    const selectedCount = document.getElementById('bulkSelectedCount');
+    const checkboxes = document.querySelectorAll('.bulk-select');
+
+    if (!selectAll || !selectedBtn || !selectedCount) {
+        return;
+    }
+
+    function refresh() {
+        const checked = document.querySelectorAll('.bulk-select:checked').length;
+        selectedCount.textContent = checked;
+        selectedBtn.disabled = checked === 0;
+        selectAll.checked = checked > 0 && checked === checkboxes.length;
+        selectAll.indeterminate = checked > 0 && checked < checkboxes.length;
+    }
+
+    selectAll.addEventListener('change', function () {
+        checkboxes.forEach((checkbox) => {
+            checkbox.checked = selectAll.checked;
+        });
+        refresh();
+    });
+
+    checkboxes.forEach((checkbox) => checkbox.addEventListener('change', refresh));
+    refresh();
+}
+
+window.addEventListener('DOMContentLoaded', setupBulkEdit);
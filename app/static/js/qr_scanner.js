@@ -6,8 +6,115 @@ const stopBtn = document.getElementById('stopBtn');
 const statusDiv = document.getElementById('status');
 const resultArea = document.getElementById('result-area');
 
+const syncUrl = document.currentScript.dataset.syncUrl;
+
 let scanning = false;
 let stream = null;
+let replicaDb = null;
+let syncing = false;
+
+// Local IndexedDB replica of assets, categories and locations. Scans are
+// resolved against it, so they work without signal; only deltas are
+// fetched from the server when the device is online.
+function openReplica() {
+    return new Promise((resolve, reject) => {
+        if (!window.indexedDB) {
+            reject(new Error('IndexedDB tidak tersedia'));
+            return;
+        }
+        const request = indexedDB.open('asset-replica', 1);
+        request.onupgradeneeded = () => {
+            const db = request.result;
+            ['assets', 'categories', 'locations'].forEach((name) => {
+                db.createObjectStore(name, { keyPath: 'id' });
+            });
+            db.createObjectStore('meta');
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+function transactionDone(tx) {
+    return new Promise((resolve, reject) => {
+        tx.oncomplete = () => resolve();
+        tx.onerror = () => reject(tx.error);
+        tx.onabort = () => reject(tx.error);
+    });
+}
+
+function getRecord(storeName, key) {
+    return new Promise((resolve, reject) => {
+        const request = replicaDb.transaction(storeName).objectStore(storeName).get(key);
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+async function applyChanges(page) {
+    const tx = replicaDb.transaction(['assets', 'categories', 'locations', 'meta'], 'readwrite');
+    ['assets', 'categories', 'locations'].forEach((name) => {
+        const store = tx.objectStore(name);
+        const fields = page[name].fields;
+        page[name].rows.forEach((row) => {
+            const record = {};
+            fields.forEach((field, i) => {
+                record[field] = row[i];
+            });
+            store.put(record);
+        });
+        page.deleted[name].forEach((id) => store.delete(id));
+    });
+    tx.objectStore('meta').put(page.cursor, 'cursor');
+    await transactionDone(tx);
+}
+
+async function syncReplica() {
+    if (syncing || !replicaDb || !navigator.onLine) return;
+    syncing = true;
+    try {
+        let cursor = (await getRecord('meta', 'cursor')) || '';
+        let more = true;
+        while (more) {
+            const response = await fetch(`${syncUrl}?cursor=${encodeURIComponent(cursor)}`, {
+                credentials: 'same-origin',
+            });
+            if (response.status === 400 && cursor) {
+                // Cursor from an older feed format: resync from scratch.
+                cursor = '';
+                continue;
+            }
+            if (!response.ok) break;
+            const page = await response.json();
+            await applyChanges(page);
+            cursor = page.cursor;
+            more = page.more;
+        }
+    } catch (err) {
+        console.warn('Sinkronisasi data aset gagal:', err);
+    } finally {
+        syncing = false;
+    }
+}
+
+async function lookupAsset(id) {
+    if (!replicaDb) return null;
+    const asset = await getRecord('assets', id);
+    if (!asset) return null;
+    const category = asset.category_id != null ? await getRecord('categories', asset.category_id) : null;
+    const location = asset.location_id != null ? await getRecord('locations', asset.location_id) : null;
+    return {
+        ...asset,
+        category_name: category ? category.name : '-',
+        location_name: location ? location.name : '-',
+    };
+}
+
+function escapeHtml(value) {
+    const div = document.createElement('div');
+    div.textContent = value == null ? '' : String(value);
+    return div.innerHTML;
+}
 
 function updateStatus(type, text) {
     statusDiv.className = 'status-indicator status-' + type;
@@ -155,16 +262,71 @@ function tick() {
     requestAnimationFrame(tick);
 }
 
-function handleQRCode(data) {
+function conditionBadge(condition) {
+    const classes = {
+        Baik: 'bg-success',
+        'Rusak Ringan': 'bg-warning',
+        'Rusak Berat': 'bg-danger',
+    };
+    return `<span class="badge ${classes[condition] || 'bg-secondary'}">${escapeHtml(condition || '-')}</span>`;
+}
+
+function showLocalAsset(asset) {
+    resultArea.innerHTML = `
+        <div class="alert alert-success">
+            <h6><i class="bi bi-check-circle"></i> QR Code Terdeteksi!</h6>
+            <code>${escapeHtml(asset.asset_code)}</code>
+        </div>
+        <table class="table table-sm">
+            <tr><th>Nama</th><td>${escapeHtml(asset.name)}</td></tr>
+            <tr><th>Kategori</th><td>${escapeHtml(asset.category_name)}</td></tr>
+            <tr><th>Lokasi</th><td>${escapeHtml(asset.location_name)}</td></tr>
+            <tr><th>Kondisi</th><td>${conditionBadge(asset.condition)}</td></tr>
+        </table>
+        ${asset.description ? `<p class="small text-muted">${escapeHtml(asset.description)}</p>` : ''}
+        <a href="/public/aset/${asset.id}" class="btn btn-primary btn-sm w-100">
+            <i class="bi bi-box-arrow-up-right"></i> Lihat Detail Lengkap
+        </a>
+    `;
+}
+
+async function handleQRCode(data) {
     scanning = false;
     stopBtn.style.display = 'none';
     startBtn.style.display = 'inline-block';
     updateStatus('ready', 'QR Terdeteksi!');
 
+    if (!data.includes('/public/aset/') && !data.includes('/aset/detail/')) {
+        showError('QR Code bukan dari sistem ini');
+        return;
+    }
+    const match = data.match(/\/(?:public\/)?aset\/(?:detail\/)?(\d+)/);
+    if (!match) {
+        showError('URL tidak valid');
+        return;
+    }
+
+    const assetId = match[1];
+    let asset = null;
+    try {
+        asset = await lookupAsset(Number(assetId));
+    } catch (err) {
+        console.warn('Gagal membaca data aset lokal:', err);
+    }
+    if (asset) {
+        showLocalAsset(asset);
+        return;
+    }
+
+    if (!navigator.onLine) {
+        showError('Aset belum tersinkron ke perangkat ini. Sambungkan ke internet lalu scan ulang.');
+        return;
+    }
+
     resultArea.innerHTML = `
         <div class="alert alert-success">
             <h6><i class="bi bi-check-circle"></i> QR Code Terdeteksi!</h6>
-            <small class="text-break">${data}</small>
+            <small class="text-break">${escapeHtml(data)}</small>
         </div>
         <div class="text-center mt-3">
             <div class="spinner-border text-primary" role="status">
@@ -173,20 +335,9 @@ function handleQRCode(data) {
             <p class="mt-2"><strong>Redirect...</strong></p>
         </div>
     `;
-
-    if (data.includes('/public/aset/') || data.includes('/aset/detail/')) {
-        const match = data.match(/\/(?:public\/)?aset\/(?:detail\/)?(\d+)/);
-        if (match) {
-            const assetId = match[1];
-            setTimeout(() => {
-                window.location.href = `/public/aset/${assetId}`;
-            }, 1000);
-        } else {
-            showError('URL tidak valid');
-        }
-    } else {
-        showError('QR Code bukan dari sistem ini');
-    }
+    setTimeout(() => {
+        window.location.href = `/public/aset/${assetId}`;
+    }, 1000);
 }
 
 startBtn.addEventListener('click', function () {
@@ -226,4 +377,14 @@ window.addEventListener('beforeunload', function () {
     }
 });
 
+window.addEventListener('online', syncReplica);
+setInterval(syncReplica, 5 * 60 * 1000);
+
+openReplica()
+    .then((db) => {
+        replicaDb = db;
+        syncReplica();
+    })
+    .catch((err) => console.warn('Replika lokal tidak tersedia:', err));
+
 initCamera();
@@ -0,0 +1,37 @@
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+
+# Per-process login buckets would multiply the limits by the worker count;
+# share them through the database instead (read by app.config.Config).
+os.environ.setdefault('LOGIN_RATE_LIMIT_BACKEND', 'db')
+
+# Import the app once in the master so workers fork with modules, compiled
+# templates and warm caches already in memory.
+preload_app = True
+
+# Workers get this long to finish in-flight requests (QR generation, photo
+# uploads) after SIGTERM/SIGHUP before they are killed.
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+accesslog = '-'
+
+
+def on_starting(server):
+    from app.app import bootstrap
+
+    bootstrap(server.app.wsgi())
+
+
+def worker_exit(server, worker):
+    from app.app import shutdown
+
+    shutdown(worker.wsgi)
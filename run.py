@@ -1,4 +1,7 @@
-from app.app import app
+from app.app import create_app, bootstrap
+
+app = create_app()
 
 if __name__ == '__main__':
+    bootstrap(app)
     app.run(debug=True)
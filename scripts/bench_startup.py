@@ -0,0 +1,58 @@
+"""Measure cold start: interpreter + imports + create_app() in a fresh process.
+
+Usage::
+
+    python scripts/bench_startup.py [runs]
+
+Each run spawns a new interpreter so nothing is cached between samples.
+It also reports whether the QR/imaging stack got imported during startup
+(it shouldn't be: ``qrcode`` and Pillow are loaded on first use).
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from app.app import create_app
+t1 = time.perf_counter()
+create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+t2 = time.perf_counter()
+print(json.dumps({
+    'import': t1 - t0,
+    'create_app': t2 - t1,
+    'qrcode_loaded': 'qrcode' in sys.modules,
+    'pil_loaded': 'PIL' in sys.modules,
+}))
+"""
+
+
+def sample():
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    samples = [sample() for _ in range(runs)]
+
+    for key in ('import', 'create_app'):
+        values = [s[key] * 1000 for s in samples]
+        print(f"{key:<12} median {statistics.median(values):7.1f} ms   min {min(values):7.1f} ms")
+    print(f"qrcode loaded at startup: {samples[0]['qrcode_loaded']}")
+    print(f"Pillow loaded at startup: {samples[0]['pil_loaded']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Smoke-check the production server setup against a throwaway SQLite DB.
+
+Usage::
+
+    python scripts/check_deploy.py
+
+Checks that:
+
+* ``bootstrap()`` creates the schema and upload folders and ``/readyz``
+  answers 200 afterwards;
+* ``gunicorn --check-config`` accepts ``gunicorn.conf.py`` (skipped when
+  gunicorn isn't installed, e.g. on Windows);
+* the installed waitress is the release ``wsgi.serve`` was written against
+  (it relies on waitress internals to drain);
+* ``wsgi.serve`` (waitress) finishes a request that is still running when
+  SIGTERM arrives, then exits cleanly (POSIX only).
+
+Exits non-zero on the first failure.
+"""
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WAITRESS_PROBE = """
+import sys, time
+from app.app import create_app, bootstrap
+from wsgi import serve
+
+app = create_app({
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + sys.argv[1] + '/app.db',
+    'UPLOAD_FOLDER': sys.argv[1] + '/uploads',
+})
+
+@app.route('/_slow')
+def slow():
+    time.sleep(2)
+    return 'done'
+
+bootstrap(app)
+serve(app, host='127.0.0.1', port=int(sys.argv[2]), graceful_timeout=10)
+"""
+
+
+def check_bootstrap(tmp):
+    from app.app import create_app, bootstrap
+
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp}/bootstrap.db',
+        'UPLOAD_FOLDER': os.path.join(tmp, 'uploads'),
+    })
+    bootstrap(app)
+    assert os.path.isdir(os.path.join(tmp, 'uploads', 'qrcodes')), 'upload folders missing'
+    response = app.test_client().get('/readyz')
+    assert response.status_code == 200, f'/readyz returned {response.status_code}'
+    app.extensions['login_guard'].shutdown()
+
+
+def check_gunicorn_config(tmp):
+    if shutil.which('gunicorn') is None:
+        return 'skipped (gunicorn not installed)'
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{tmp}/gunicorn.db')
+    subprocess.run(
+        ['gunicorn', '--check-config', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=ROOT, env=env, check=True, capture_output=True,
+    )
+
+
+def check_waitress_version(tmp):
+    from importlib.metadata import version
+
+    from wsgi import WAITRESS_VERSION
+
+    installed = version('waitress')
+    assert installed == WAITRESS_VERSION, (
+        f'waitress {installed} installed, wsgi.serve is written for {WAITRESS_VERSION}'
+    )
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def check_waitress_drain(tmp):
+    if os.name != 'posix':
+        return 'skipped (needs POSIX signals)'
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, '-c', WAITRESS_PROBE, tmp, str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/healthz', timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise AssertionError('waitress did not start')
+
+        result = {}
+
+        def fetch():
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_slow', timeout=10) as resp:
+                result['body'] = resp.read()
+
+        client = threading.Thread(target=fetch)
+        client.start()
+        time.sleep(0.5)
+        proc.send_signal(signal.SIGTERM)
+        client.join()
+        assert result.get('body') == b'done', 'in-flight request was dropped'
+        assert proc.wait(timeout=10) == 0, 'waitress did not exit cleanly'
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    try:
+        for check in (
+            check_bootstrap,
+            check_gunicorn_config,
+            check_waitress_version,
+            check_waitress_drain,
+        ):
+            print(f'{check.__name__:<24} {check(tmp) or "ok"}')
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Production entry point.
+
+Linux/macOS (prefork, app preloaded in the master)::
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Windows (single process, multi-threaded)::
+
+    python wsgi.py
+"""
+import logging
+import os
+import signal
+import time
+
+from app.app import create_app, bootstrap, shutdown
+
+app = create_app()
+
+# serve() drives waitress's event loop through internals (server._map,
+# server.asyncore, active_channels, channel.requests, total_outbufs_len)
+# because waitress has no public drain API. They were checked against this
+# exact release, which requirements.txt pins; on any other version serve()
+# falls back to waitress's own run loop (no drain) instead of breaking.
+# scripts/check_deploy.py fails if the installed version differs.
+WAITRESS_VERSION = '2.1.2'
+
+
+def _in_flight(server):
+    return any(
+        channel.requests or channel.total_outbufs_len
+        for channel in list(server.active_channels.values())
+    )
+
+
+def serve(app, graceful_timeout=None, **kwargs):
+    """Run ``app`` under waitress and drain in-flight requests on shutdown.
+
+    On SIGTERM/SIGINT (Ctrl+C, or Ctrl+Break on Windows) the listening
+    socket is closed at once, requests already accepted keep being served
+    until they finish or ``graceful_timeout`` seconds pass, and only then
+    are the worker threads stopped. This mirrors gunicorn's
+    ``graceful_timeout``; plain ``waitress.serve`` drops such responses.
+    """
+    from importlib.metadata import version
+    from waitress.server import create_server
+
+    if graceful_timeout is None:
+        graceful_timeout = int(os.environ.get('WAITRESS_GRACEFUL_TIMEOUT', 30))
+
+    server = create_server(app, **kwargs)
+    if version('waitress') != WAITRESS_VERSION:
+        logging.getLogger(__name__).warning(
+            'waitress %s is not the tested %s; shutting down without draining requests',
+            version('waitress'), WAITRESS_VERSION,
+        )
+        server.print_listen('Serving on http://{}:{}')
+        server.run()
+        shutdown(app)
+        return
+
+    deadline = []
+
+    def stop(signum, frame):
+        if not deadline:
+            deadline.append(time.monotonic() + graceful_timeout)
+
+    for name in ('SIGTERM', 'SIGINT', 'SIGBREAK'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), stop)
+
+    server.print_listen('Serving on http://{}:{}')
+    listening = True
+    while not deadline or (_in_flight(server) and time.monotonic() < deadline[0]):
+        if deadline and listening:
+            # Stop accepting between poll rounds, never while select() holds the fd.
+            server.del_channel()
+            server.socket.close()
+            listening = False
+        server.asyncore.loop(
+            timeout=server.adj.asyncore_loop_timeout,
+            map=server._map,
+            use_poll=server.adj.asyncore_use_poll,
+            count=1,
+        )
+    server.task_dispatcher.shutdown(cancel_pending=True, timeout=1)
+    shutdown(app)
+
+
+if __name__ == '__main__':
+    logging.basicConfig()
+    bootstrap(app)
+    serve(
+        app,
+        host=os.environ.get('HOST', '0.0.0.0'),
+        port=int(os.environ.get('PORT', 8000)),
+        threads=int(os.environ.get('WAITRESS_THREADS', 8)),
+        channel_timeout=int(os.environ.get('WAITRESS_CHANNEL_TIMEOUT', 30)),
+    )